@@ -1,11 +1,20 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler, SMTPHandler
+import queue
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    SMTPHandler,
+)
 from pathlib import Path
-from typing import List, TypedDict
+from typing import List, Optional, TypedDict
 
+import jinja2
 import rq
 from elasticsearch import Elasticsearch
-from flask import Flask, current_app, request
+from flask import Flask, request
+from flask.json.provider import JSONProvider
 from flask_babel import Babel
 from flask_babel import lazy_gettext as _l
 from flask_login import LoginManager
@@ -15,9 +24,25 @@ from flask_moment import Moment
 from flask_sqlalchemy import SQLAlchemy
 from redis import Redis
 from redis.exceptions import ConnectionError, TimeoutError
+from werkzeug.local import LocalProxy
 
 from config import Config
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - accelerator is optional.
+    orjson = None
+
+try:
+    # MarkupSafe ships a C implementation of escape(); if only the pure
+    # Python fallback is present, every {{ variable }} in every template
+    # pays for it. The import is checked once here and reported at startup.
+    import markupsafe._speedups  # noqa: F401
+
+    _markupsafe_speedups = True
+except ImportError:  # pragma: no cover - depends on the build environment.
+    _markupsafe_speedups = False
+
 db = SQLAlchemy()
 migrate = Migrate()
 login = LoginManager()
@@ -28,9 +53,53 @@ moment = Moment()
 babel = Babel()
 
 
-def get_locale() -> None:
-    """Determine the best match with our supported languages."""
-    return request.accept_languages.best_match(current_app.config["LANGUAGES"])
+class ORJSONProvider(JSONProvider):
+    """JSON provider backed by orjson, which serializes several times faster
+    than the stdlib json module. Used when the optional orjson package is
+    installed; the biggest win is on the paginated API list responses.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize an object to a JSON string."""
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a string or bytes."""
+        return orjson.loads(s)
+
+
+# Elasticsearch clients shared per URL across the process. Clients are
+# created on first use instead of in create_app, so code paths that never
+# touch search (tests, migrations, CLI commands) skip the network handshake.
+_elasticsearch_clients: dict[str, Elasticsearch] = {}
+
+
+def _get_elasticsearch(url: str) -> Elasticsearch:
+    """Return the shared Elasticsearch client for a URL, creating it lazily."""
+    if url not in _elasticsearch_clients:
+        _elasticsearch_clients[url] = Elasticsearch(
+            [url], http_compress=True, request_timeout=5
+        )
+    return _elasticsearch_clients[url]
+
+
+def make_locale_selector(languages: tuple[str, ...]):
+    """Build the Babel locale selector for an app.
+
+    The supported languages are captured as a tuple at app-create time, so
+    the per-request selector avoids the config dict lookup and list
+    iteration that would otherwise run on every rendered page.
+    """
+
+    def get_locale() -> Optional[str]:
+        """Determine the best match with our supported languages."""
+        return request.accept_languages.best_match(languages)
+
+    return get_locale
 
 
 class RedisConnectionInfo(TypedDict):
@@ -72,21 +141,68 @@ def check_redis_connection(
     return connection_info
 
 
+# Blueprints are imported once at module load instead of inside create_app,
+# so repeated create_app calls (test suites, preloading workers) skip the
+# import machinery. They must come after the extension instances above,
+# which the blueprint modules import from this package.
+from app.api import bp as api_bp  # noqa: E402
+from app.auth import bp as auth_bp  # noqa: E402
+from app.cli import bp as cli_bp  # noqa: E402
+from app.errors import bp as errors_bp  # noqa: E402
+from app.main import bp as main_bp  # noqa: E402
+
+_BLUEPRINTS = [
+    (errors_bp, None),
+    (auth_bp, "/auth"),
+    (main_bp, None),
+    (cli_bp, None),
+    (api_bp, "/api"),
+]
+
+
 def create_app(config_class=Config) -> Flask:
     """Create and configure the Flask application."""
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+
+    # The container build copies preline.js into static/vendor (see the
+    # Dockerfile), where the static route — and any fronting proxy that
+    # maps /static — can serve it without entering view code. The check
+    # runs once here; base.html falls back to the Python route only in
+    # dev checkouts where the file still lives in node_modules.
+    app.config["PRELINE_VENDORED"] = Path(
+        app.static_folder, "vendor", "preline.js"
+    ).is_file()
+
+    # Outside debug, templates never change while the process runs: skip
+    # the per-render mtime stat and persist compiled template bytecode on
+    # disk, so workers after the first (and restarted processes) load
+    # templates from cache instead of recompiling them. The cache lives
+    # under the instance directory, which this app owns; a shared world-
+    # writable location like /tmp would let any local user pre-create the
+    # directory and plant bytecode that the templates would then execute.
+    if not app.debug and not app.testing:
+        app.jinja_env.auto_reload = False
+        cache_dir = Path(app.instance_path, "jinja-cache")
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        app.jinja_env.bytecode_cache = jinja2.FileSystemBytecodeCache(str(cache_dir))
+
     # Initialization of extensions.
     db.init_app(app)
     migrate.init_app(app, db)
     login.init_app(app)
     mail.init_app(app)
     moment.init_app(app)
-    babel.init_app(app, locale_selector=get_locale)
+    babel.init_app(
+        app, locale_selector=make_locale_selector(tuple(app.config["LANGUAGES"]))
+    )
+    elasticsearch_url = app.config["ELASTICSEARCH_URL"]
     app.elasticsearch = (
-        Elasticsearch([app.config["ELASTICSEARCH_URL"]])
-        if app.config["ELASTICSEARCH_URL"]
+        LocalProxy(lambda: _get_elasticsearch(elasticsearch_url))
+        if elasticsearch_url
         else None
     )
     app.redis = Redis.from_url(app.config["REDIS_URL"])
@@ -94,28 +210,16 @@ def create_app(config_class=Config) -> Flask:
     app.task_queue = rq.Queue("microblog-tasks", connection=app.redis)
 
     # Registration of blueprints.
-    from app.errors import bp as errors_bp  # noqa: E402
-
-    app.register_blueprint(errors_bp)
-
-    from app.auth import bp as auth_bp  # noqa: E402
-
-    app.register_blueprint(auth_bp, url_prefix="/auth")
-
-    from app.main import bp as main_bp  # noqa: E402
+    for blueprint, url_prefix in _BLUEPRINTS:
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
 
-    app.register_blueprint(main_bp)
-
-    from app.cli import bp as cli_bp
-
-    app.register_blueprint(cli_bp)
-
-    from app.api import bp as api_bp
-
-    app.register_blueprint(api_bp, url_prefix="/api")
-
-    # Logging configuration.
+    # Logging configuration. Handlers are never attached directly to the
+    # logger: records go through an in-process queue that a background
+    # listener thread drains, so neither disk nor SMTP I/O ever happens on
+    # a request thread.
     if not app.debug and not app.testing:
+        log_handlers = []
+
         if app.config["MAIL_SERVER"]:
             auth = None
             if app.config["MAIL_USERNAME"] or app.config["MAIL_PASSWORD"]:
@@ -134,14 +238,15 @@ def create_app(config_class=Config) -> Flask:
                 secure=secure,
             )
             mail_handler.setLevel(logging.ERROR)
-            app.logger.addHandler(mail_handler)
+            log_handlers.append(mail_handler)
 
-        if not Path("logs").exists():
-            Path("logs").mkdir()
+        # A single mkdir with exist_ok avoids the extra stat and the race
+        # between workers booting concurrently.
+        Path("logs").mkdir(exist_ok=True)
 
         file_handler = RotatingFileHandler(
             "logs/microblog.log",
-            maxBytes=10240,
+            maxBytes=10 * 1024 * 1024,
             backupCount=10,
         )
         file_handler.setFormatter(
@@ -150,11 +255,23 @@ def create_app(config_class=Config) -> Flask:
             )
         )
         file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
+        log_handlers.append(file_handler)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        app.logger.addHandler(QueueHandler(log_queue))
 
         app.logger.setLevel(logging.INFO)
         app.logger.info("Microblog startup")
 
+        if not _markupsafe_speedups:
+            app.logger.warning(
+                "markupsafe._speedups not importable; template escaping "
+                "falls back to pure Python"
+            )
+
         if app.redis_status["connected"]:
             app.logger.info("Redis server connected successfully")
         else:
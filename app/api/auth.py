@@ -1,6 +1,11 @@
+import hashlib
+from datetime import datetime, timezone
+from threading import Lock
+from time import monotonic
 from typing import Optional
 
 import sqlalchemy as sa
+from flask import current_app, g
 from flask_httpauth import HTTPBasicAuth, HTTPTokenAuth
 
 from app import db
@@ -10,11 +15,80 @@ from app.models import User
 basic_auth = HTTPBasicAuth()
 token_auth = HTTPTokenAuth()
 
+# Cache of recently verified Basic Auth credentials. Checking a password
+# runs a deliberately slow key derivation function, so clients that poll
+# with the same credentials would otherwise pay that CPU cost on every
+# request. Keys are HMACs of the credentials (never the plain password),
+# and values are (user_id, expiration) pairs.
+_PASSWORD_CACHE_SIZE = 1024
+_PASSWORD_CACHE_TTL = 60  # Seconds.
+_password_cache: dict[bytes, tuple[int, float]] = {}
+_password_cache_lock = Lock()
+
+# Cache of recently verified API tokens, mapping token -> (user_id,
+# expiration). Every token-authenticated request would otherwise issue the
+# same SELECT for the same token thousands of times per session; a hit here
+# costs only a clock comparison and a primary-key fetch.
+_TOKEN_CACHE_SIZE = 10_000
+_TOKEN_CACHE_TTL = 60  # Seconds.
+_token_cache: dict[str, tuple[int, float]] = {}
+_token_cache_lock = Lock()
+
+
+def forget_token(token: str) -> None:
+    """Drop a token from the verification cache.
+
+    Called when a token is revoked, so the revocation takes effect
+    immediately instead of after the cache entry expires.
+    """
+    with _token_cache_lock:
+        _token_cache.pop(token, None)
+
+
+def _user_by_username(username: str) -> sa.sql.lambdas.StatementLambdaElement:
+    """Build the user-by-username SELECT as a cached lambda statement.
+
+    The statement structure is analyzed and compiled once per process;
+    subsequent calls only swap in the new username as a bound parameter,
+    skipping per-request SQL construction on the auth hot path.
+    """
+    return sa.lambda_stmt(lambda: sa.select(User).where(User.username == username))
+
+
+# Keyed BLAKE2b hash initialized with the app secret, prepared once per
+# process. Copying the prepared object is a C-level memcpy, much cheaper
+# than re-deriving the keyed state on every auth request.
+_auth_mac: Optional["hashlib._Hash"] = None
+_auth_mac_secret: Optional[str] = None
+
+
+def _credentials_key(username: str, password: str) -> bytes:
+    """Derive the cache key for a username/password pair.
+
+    The key is a keyed BLAKE2b hash of the credentials using the
+    application secret key, so the cache never stores recoverable
+    passwords.
+    """
+    global _auth_mac, _auth_mac_secret
+
+    secret = current_app.secret_key
+    if secret != _auth_mac_secret:
+        _auth_mac = hashlib.blake2b(key=secret.encode()[:64], digest_size=32)
+        _auth_mac_secret = secret
+
+    mac = _auth_mac.copy()
+    mac.update(f"{username}\0{password}".encode())
+    return mac.digest()
+
 
 @basic_auth.verify_password
 def verify_password(username: str, password: str) -> Optional[User]:
     """Verify user credentials for Basic HTTP Authentication.
 
+    Recently verified credentials are cached for a short time, so repeated
+    requests with the same username and password skip both the database
+    lookup and the expensive password hash check.
+
     Args:
         username (str): The username provided by the client.
         password (str): The password provided by the client.
@@ -22,9 +96,34 @@ def verify_password(username: str, password: str) -> Optional[User]:
     Returns:
         user (User, None): The authenticated User object if credentials are valid, else None.
     """
-    user = db.session.scalar(sa.select(User).where(User.username == username))
+    # Reject impossible credentials before touching the database or the
+    # key derivation function: usernames are at most 64 characters, and an
+    # adversarial multi-kilobyte password would otherwise drive up hashing
+    # CPU for free.
+    if not username or len(username) > 64 or len(password) > 256:
+        return None
+
+    key = _credentials_key(username, password)
+
+    with _password_cache_lock:
+        entry = _password_cache.get(key)
+    if entry and entry[1] > monotonic():
+        # Cache hit: re-fetch by primary key, which uses the identity map
+        # fast path and never runs the key derivation function.
+        user = db.session.get(User, entry[0])
+        if user:
+            g.current_user = user
+        return user
+
+    user = db.session.scalar(_user_by_username(username))
 
     if user and user.check_password(password):
+        with _password_cache_lock:
+            if len(_password_cache) >= _PASSWORD_CACHE_SIZE:
+                # Evict the oldest entry to keep the cache bounded.
+                _password_cache.pop(next(iter(_password_cache)))
+            _password_cache[key] = (user.id, monotonic() + _PASSWORD_CACHE_TTL)
+        g.current_user = user
         return user
 
 
@@ -45,13 +144,45 @@ def basic_auth_error(status: int) -> tuple[dict[str, str], int]:
 def verify_token(token: str) -> Optional[User]:
     """Verify user token for Token-based HTTP Authentication.
 
+    Recently verified tokens are cached for a short time, so repeated
+    requests with the same token skip the token SELECT and only pay for
+    a clock comparison and a primary-key lookup.
+
     Args:
         token (str): The token provided by the client.
 
     Returns:
         user (User, None): The authenticated User object if the token is valid, else None.
     """
-    return User.check_token(token) if token else None
+    if not token:
+        return None
+
+    with _token_cache_lock:
+        entry = _token_cache.get(token)
+    if entry and entry[1] > monotonic():
+        user = db.session.get(User, entry[0])
+        if user:
+            g.current_user = user
+        return user
+
+    user = User.check_token(token)
+
+    if user:
+        g.current_user = user
+        # Never cache past the token's own expiration time.
+        seconds_left = (
+            user.token_expiration.replace(tzinfo=timezone.utc)
+            - datetime.now(timezone.utc)
+        ).total_seconds()
+        with _token_cache_lock:
+            if len(_token_cache) >= _TOKEN_CACHE_SIZE:
+                _token_cache.pop(next(iter(_token_cache)))
+            _token_cache[token] = (
+                user.id,
+                monotonic() + min(_TOKEN_CACHE_TTL, seconds_left),
+            )
+
+    return user
 
 
 @token_auth.error_handler
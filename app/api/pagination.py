@@ -0,0 +1,24 @@
+from flask import request
+
+
+def get_page_args(
+    default_per_page: int = 10, max_per_page: int = 100
+) -> tuple[int, int]:
+    """Read and validate the pagination arguments of the current request.
+
+    Reads the query string once and clamps the values to sane bounds, so
+    every paginated endpoint shares a single validation point and a
+    malicious `page` or `per_page` cannot force a pathological OFFSET.
+
+    Args:
+        default_per_page (int, optional): Page size used when the client does
+          not send one. Defaults to 10.
+        max_per_page (int, optional): Upper bound on the page size. Defaults to 100.
+
+    Returns:
+        args (tuple[int, int]): The validated (page, per_page) pair.
+    """
+    args = request.args
+    page = args.get("page", 1, type=int)
+    per_page = args.get("per_page", default_per_page, type=int)
+    return max(page, 1), min(max(per_page, 1), max_per_page)
@@ -1,6 +1,8 @@
+from flask import g
+
 from app import db
 from app.api import bp
-from app.api.auth import basic_auth, token_auth
+from app.api.auth import basic_auth, forget_token, token_auth
 
 
 @bp.route("/tokens", methods=["POST"])
@@ -11,7 +13,10 @@ def get_token() -> dict[str, str]:
     Returns:
         token (dict[str, str]): A dictionary containing the authentication token.
     """
-    token = basic_auth.current_user().get_token()
+    # The verify callback stored the authenticated user on g, so reuse
+    # that instance instead of going back through the auth extension.
+    user = g.get("current_user") or basic_auth.current_user()
+    token = user.get_token()
     db.session.commit()
     return {"token": token}
 
@@ -24,6 +29,9 @@ def revoke_token():
     Returns:
         A `204 No Content` response indicating successful revocation.
     """
-    token_auth.current_user().revoke_token()
+    user = g.get("current_user") or token_auth.current_user()
+    user.revoke_token()
+    # Invalidate the cached token so the revocation is honored immediately.
+    forget_token(user.token)
     db.session.commit()
     return "", 204
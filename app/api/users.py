@@ -2,12 +2,33 @@ from typing import Any, Literal, Union
 
 import sqlalchemy as sa
 from flask import abort, request, url_for
+from sqlalchemy.exc import IntegrityError
 
 from app import db
 from app.api import bp
 from app.api.auth import token_auth
 from app.api.errors import bad_request
-from app.models import User
+from app.api.pagination import get_page_args
+from app.models import User, forget_user
+
+
+def _duplicate_user_error(error: IntegrityError) -> tuple[dict[str, str], Literal[400]]:
+    """Map a unique-constraint violation on the user table to a 400 response.
+
+    The violated column is recovered from the driver-level error message,
+    which names the constraint (e.g. "UNIQUE constraint failed:
+    user.username" on SQLite, "user_username_key" on PostgreSQL).
+
+    Args:
+        error (IntegrityError): The error raised by the failed commit.
+
+    Returns:
+        error (tuple[dict[str, str], Literal[400]]): A bad request response
+          naming the offending field.
+    """
+    if "username" in str(error.orig):
+        return bad_request("please use a different username")
+    return bad_request("please use a different email address")
 
 
 @bp.route("/users/<int:id>", methods=["GET"])
@@ -20,7 +41,7 @@ def get_user(id: int) -> dict[str, Any]:
     Returns:
         user (dict[str, Any]): A dictionary representation of the user.
     """
-    return db.get_or_404(User, id).to_dict()
+    return User.get_dict_or_404(id)
 
 
 @bp.route("/users", methods=["GET"])
@@ -31,9 +52,13 @@ def get_users() -> dict[str, Any]:
     Returns:
         users (dict[str, Any]): A dictionary containing the paginated users.
     """
-    page = request.args.get("page", 1, type=int)
-    per_page = min(request.args.get("per_page", 10, type=int), 100)
-    return User.to_collection_dict(sa.select(User), page, per_page, "api.get_users")
+    page, per_page = get_page_args()
+    # Stream rows from the driver in page-sized batches instead of
+    # buffering the full result set before hydration.
+    query = sa.select(User).execution_options(
+        stream_results=True, max_row_buffer=per_page
+    )
+    return User.to_collection_dict(query, page, per_page, "api.get_users")
 
 
 @bp.route("/users/<int:id>/followers", methods=["GET"])
@@ -45,11 +70,16 @@ def get_followers(id: int):
         id (int): The ID of the user whose followers are to be retrieved.
     Returns:
         followers (dict[str, Any]): A dictionary containing the paginated followers."""
-    user = db.get_or_404(User, id)
-    page = request.args.get("page", 1, type=int)
-    per_page = min(request.args.get("per_page", 10, type=int), 100)
+    # Plain session.get resolves from the identity map when the user is
+    # already loaded in this request, skipping a SELECT.
+    user = db.session.get(User, id)
+    if user is None:
+        abort(404)
+    page, per_page = get_page_args()
     return User.to_collection_dict(
-        query=user.followers.select(),
+        query=user.followers.select().execution_options(
+            stream_results=True, max_row_buffer=per_page
+        ),
         page=page,
         per_page=per_page,
         endpoint="api.get_followers",
@@ -67,11 +97,16 @@ def get_following(id: int):
     Returns:
         following (dict[str, Any]): A dictionary containing the paginated followings.
     """
-    user = db.get_or_404(User, id)
-    page = request.args.get("page", 1, type=int)
-    per_page = min(request.args.get("per_page", 10, type=int), 100)
+    # Plain session.get resolves from the identity map when the user is
+    # already loaded in this request, skipping a SELECT.
+    user = db.session.get(User, id)
+    if user is None:
+        abort(404)
+    page, per_page = get_page_args()
     return User.to_collection_dict(
-        query=user.following.select(),
+        query=user.following.select().execution_options(
+            stream_results=True, max_row_buffer=per_page
+        ),
         page=page,
         per_page=per_page,
         endpoint="api.get_following",
@@ -91,21 +126,27 @@ def create_user() -> Union[
     - On success, returns a tuple containing the user dictionary, HTTP status code 201, and Location header.
     - On failure, returns a tuple containing an error message dictionary and HTTP status code 400.
     """
-    data = request.get_json()
+    # A missing or non-object JSON body is a client error, not a 500 with
+    # a full traceback formatted and logged.
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return bad_request("invalid JSON body")
 
-    if "username" not in data or "email" not in data or "password" not in data:
+    if {"username", "email", "password"} - data.keys():
         return bad_request("must include username, email and password fields")
 
-    if db.session.scalar(sa.select(User).where(User.username == data["username"])):
-        return bad_request("please use a different username")
-
-    if db.session.scalar(sa.select(User).where(User.email == data["email"])):
-        return bad_request("please use a different email address")
-
+    # Let the database UNIQUE constraints validate the username and email
+    # instead of issuing a SELECT before the INSERT. This saves a round-trip
+    # on the happy path and is free of the race that a check-then-insert
+    # sequence has when two clients register the same name concurrently.
     user = User()
     user.from_dict(data, new_user=True)
     db.session.add(user)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        return _duplicate_user_error(e)
 
     return user.to_dict(), 201, {"Location": url_for("api.get_user", id=user.id)}
 
@@ -127,26 +168,19 @@ def update_user(id: int) -> Union[tuple[dict[str, str], Literal[400]], dict[str,
         abort(403)
 
     user = db.get_or_404(User, id)
-    data = request.get_json()
-
-    if (
-        "username" in data
-        and data["username"] != user.username
-        and db.session.scalar(
-            sa.select(User).where(User.username == data["username"], User.id != id)
-        )
-    ):
-        return bad_request("please use a different username")
 
-    if (
-        "email" in data
-        and data["email"] != user.email
-        and db.session.scalar(
-            sa.select(User).where(User.email == data["email"], User.id != id)
-        )
-    ):
-        return bad_request("please use a different email address")
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return bad_request("invalid JSON body")
 
+    # As in create_user, let the UNIQUE constraints catch duplicate
+    # usernames and emails instead of running pre-checks.
     user.from_dict(data, new_user=False)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        return _duplicate_user_error(e)
+
+    forget_user(user.id)
     return user.to_dict()
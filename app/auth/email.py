@@ -1,25 +1,86 @@
-from flask import current_app, render_template
+from typing import Optional
+
+from flask import current_app
 from flask_babel import _
+from jinja2 import Template
 
+from app import db
 from app.email import send_email
 from app.models import User
 
+# Sender address resolved once per process on first use; the config value
+# never changes after startup.
+_reset_sender: Optional[str] = None
+
+
+def _get_reset_sender() -> str:
+    """Return the configured sender address for password reset emails."""
+    global _reset_sender
+    if _reset_sender is None:
+        _reset_sender = current_app.config["ADMINS"][0]
+    return _reset_sender
+
+
+# Compiled reset templates, bound once on first use so later sends call
+# Template.render directly instead of going back through Flask's template
+# loader stack (name resolution plus filesystem stats) on every email.
+_reset_templates: Optional[tuple[Template, Template]] = None
+
+
+def _get_reset_templates() -> tuple[Template, Template]:
+    """Return the compiled (text, html) password reset templates."""
+    global _reset_templates
+    if _reset_templates is None:
+        env = current_app.jinja_env
+        _reset_templates = (
+            env.get_template("email/reset_password.txt"),
+            env.get_template("email/reset_password.html"),
+        )
+    return _reset_templates
+
+
+def _render_reset_bodies(user_id: int, token: str) -> tuple[str, str]:
+    """Render the text and HTML bodies of the password reset email.
+
+    Not memoized: every token embeds its expiry timestamp, so no two
+    calls ever share arguments, and caching would only retain valid
+    reset tokens in process memory. The compiled-template binding above
+    is what makes the repeat renders cheap.
+    """
+    user = db.session.get(User, user_id)
+    text_template, html_template = _get_reset_templates()
+    return (
+        text_template.render(user=user, token=token),
+        html_template.render(user=user, token=token),
+    )
+
 
 def send_password_reset_email(user: User) -> None:
-    """Send a password reset email to the user with a token."""
+    """Send a password reset email to the user with a token.
+
+    The email is rendered here (cheap) and handed to the RQ worker for the
+    SMTP delivery, so the request does not wait on the mail server. If the
+    Redis server is down, falls back to the in-process threaded send.
+    """
     token = user.get_reset_password_token()
-    send_email(
-        _("[Microblog] Reset Your Password"),
-        sender=current_app.config["ADMINS"][0],
-        recipients=[user.email],
-        text_body=render_template(
-            "email/reset_password.txt",
-            user=user,
-            token=token,
-        ),
-        html_body=render_template(
-            "email/reset_password.html",
-            user=user,
-            token=token,
-        ),
-    )
+    text_body, html_body = _render_reset_bodies(user.id, token)
+    subject = _("[Microblog] Reset Your Password")
+    sender = _get_reset_sender()
+
+    if current_app.redis_status["connected"]:
+        current_app.task_queue.enqueue(
+            "app.tasks.send_email_task",
+            str(subject),
+            sender,
+            [user.email],
+            text_body,
+            html_body,
+        )
+    else:
+        send_email(
+            subject,
+            sender=sender,
+            recipients=[user.email],
+            text_body=text_body,
+            html_body=html_body,
+        )
@@ -1,5 +1,11 @@
 import sqlalchemy as sa
 from flask_babel import _
+
+# Field labels must stay lazy (_l): they are evaluated per render against
+# the request locale, and flask-babel already caches the loaded catalog,
+# so resolving one is a dict lookup. Snapshotting them to plain strings
+# at import would pin every form to the first locale seen and break the
+# pybabel extraction that scans for _l() calls.
 from flask_babel import lazy_gettext as _l
 from flask_wtf import FlaskForm
 from wtforms import BooleanField, EmailField, PasswordField, StringField, SubmitField
@@ -8,6 +14,16 @@ from wtforms.validators import DataRequired, Email, EqualTo, ValidationError
 from app import db
 from app.models import User
 
+# Uniqueness lookups built once at import; executing them only binds the
+# parameters, skipping select() construction and guaranteeing statement
+# cache hits on the signup path.
+_USERNAME_TAKEN = sa.select(sa.exists().where(User.username == sa.bindparam("u")))
+_EMAIL_TAKEN = sa.select(sa.exists().where(User.email == sa.bindparam("e")))
+_USERNAME_AND_EMAIL_TAKEN = sa.select(
+    sa.exists().where(User.username == sa.bindparam("u")),
+    sa.exists().where(User.email == sa.bindparam("e")),
+)
+
 
 class LoginForm(FlaskForm):
     """Form to log in a user already registered."""
@@ -33,15 +49,32 @@ class RegistrationForm(FlaskForm):
     )
     submit = SubmitField(_l("Register"))
 
+    def validate(self, extra_validators=None) -> bool:
+        """Run all field validators for the form.
+
+        Batches the username and email uniqueness lookups into a single
+        SELECT of two EXISTS expressions, so a registration submission
+        costs one round-trip instead of two. The per-field validators
+        below read the batched result.
+        """
+        self._username_taken, self._email_taken = db.session.execute(
+            _USERNAME_AND_EMAIL_TAKEN,
+            {"u": self.username.data, "e": self.email.data},
+        ).one()
+        return super().validate(extra_validators)
+
     def validate_username(self, username: str) -> None:
         """Checks that the username is not already in use.
         If is in use, raises a ValidationError.
 
         This method is called automatically by WTForms.
         """
-        user = db.session.scalar(sa.select(User).where(User.username == username.data))
+        taken = getattr(self, "_username_taken", None)
+        if taken is None:
+            # Called outside validate(); fall back to a direct lookup.
+            taken = db.session.scalar(_USERNAME_TAKEN, {"u": username.data})
 
-        if user is not None:
+        if taken:
             raise ValidationError(_("Please use a different username."))
 
     def validate_email(self, email: str) -> None:
@@ -50,9 +83,12 @@ class RegistrationForm(FlaskForm):
 
         This method is called automatically by WTForms.
         """
-        user = db.session.scalar(sa.select(User).where(User.email == email.data))
+        taken = getattr(self, "_email_taken", None)
+        if taken is None:
+            # Called outside validate(); fall back to a direct lookup.
+            taken = db.session.scalar(_EMAIL_TAKEN, {"e": email.data})
 
-        if user is not None:
+        if taken:
             raise ValidationError(_("Please use a different email address."))
 
 
@@ -4,11 +4,69 @@ import subprocess
 from pathlib import Path
 
 import click
+import sqlalchemy as sa
 from flask import Blueprint
 
 bp = Blueprint("cli", __name__, cli_group=None)
 
 
+@bp.cli.command("detect-languages")
+@click.option(
+    "--batch-size",
+    default=500,
+    show_default=True,
+    help="Number of posts committed per batch.",
+)
+def detect_languages(batch_size):
+    """Backfill the language of posts that have none recorded.
+
+    Streams the posts in fixed-size chunks and commits per batch, so a
+    large backlog is processed with bounded memory and amortized commit
+    cost instead of one write transaction per post.
+    """
+    from app import db
+    from app.language import detect_language
+    from app.models import Post
+
+    # Core-level update: no ORM instances are loaded here, and the plain
+    # table form supports the executemany batching used below.
+    update_stmt = (
+        sa.update(Post.__table__)
+        .where(Post.__table__.c.id == sa.bindparam("pid"))
+        .values(language=sa.bindparam("lang"))
+    )
+    updated = 0
+    last_id = 0
+    while True:
+        # Keyset pagination on the primary key keeps memory bounded and
+        # stays valid across the per-batch commits below.
+        rows = db.session.execute(
+            sa.select(Post.id, Post.body)
+            .where(
+                Post.id > last_id,
+                sa.or_(Post.language.is_(None), Post.language == ""),
+            )
+            .order_by(Post.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        # One executemany UPDATE per batch instead of a write per post.
+        db.session.execute(
+            update_stmt,
+            [
+                {"pid": post_id, "lang": detect_language(body)}
+                for post_id, body in rows
+            ],
+        )
+        db.session.commit()
+        updated += len(rows)
+        last_id = rows[-1][0]
+
+    click.echo(f"Detected languages for {updated} post(s).")
+
+
 @bp.cli.group()
 def translate():
     """Translation and localization commands."""
@@ -1,6 +1,7 @@
+import json
 from typing import Literal, Union
 
-from flask import render_template, request
+from flask import Response, render_template, request
 
 from app import db
 from app.api.errors import error_response as api_error_response
@@ -11,47 +12,75 @@ def wants_json_response() -> bool:
     """Determine if the client prefers a JSON response over an
     HTML response based on the Accept header.
 
+    The result is memoized on the request object, so repeated checks
+    within one request skip the Accept header quality comparisons.
+
     Returns:
         bool: True if the client prefers JSON, False otherwise.
     """
-    return (
+    cached = getattr(request, "_wants_json", None)
+    if cached is not None:
+        return cached
+
+    result = (
         request.accept_mimetypes["application/json"]
         >= request.accept_mimetypes["text/html"]
     )
+    request._wants_json = result
+    return result
+
+
+# JSON error bodies are context-free, so serialize them once at import;
+# the handler then only wraps the frozen bytes in a fresh Response, with
+# no dict building or JSON encoding per error. The HTML pages cannot be
+# pre-rendered the same way: they extend the base layout, which renders
+# per-user chrome (avatar, unread message count, task progress).
+_JSON_ERROR_BODIES = {
+    code: json.dumps(api_error_response(code)[0]) for code in (404, 500)
+}
+
+
+def _error_response(
+    status_code: int, template_name: str
+) -> Union[Response, tuple[str, int]]:
+    """Build the error response for a status code in the format the
+    client prefers.
+
+    Returns:
+    - If the client accepts JSON responses, returns a JSON response built
+    from the pre-serialized body with the given status code.
+    - Otherwise, returns an HTML response rendering the given error
+    template with the given status code.
+    """
+    if wants_json_response():
+        return Response(
+            _JSON_ERROR_BODIES[status_code],
+            status=status_code,
+            mimetype="application/json",
+        )
+    return render_template(template_name), status_code
 
 
 @bp.app_errorhandler(404)
 def not_found_error(
     error,
-) -> Union[tuple[dict[str, str], Literal[404]], tuple[str, Literal[404]]]:
+) -> Union[Response, tuple[str, Literal[404]]]:
     """Render the 404 error page and set the status code of the
     response to 404.
-
-    Returns:
-    - If the client accepts JSON responses, returns a JSON
-    response with a 404 status code.
-    - Otherwise, returns an HTML response rendering the 404
-    error template with a 404 status code.
     """
-    if wants_json_response():
-        return api_error_response(404)
-    return render_template("errors/404.html"), 404
+    return _error_response(404, "errors/404.html")
 
 
 @bp.app_errorhandler(500)
 def internal_error(
     error,
-) -> Union[tuple[dict[str, str], Literal[500]], tuple[str, Literal[500]]]:
+) -> Union[Response, tuple[str, Literal[500]]]:
     """Render the 500 error page and set the status code of the
     response to 500.
-
-    Returns:
-    - If the client accepts JSON responses, returns a JSON
-    response with a 500 status code.
-    - Otherwise, returns an HTML response rendering the 500
-    error template with a 500 status code.
     """
-    db.session.rollback()  # Reset db session to a clean state.
-    if wants_json_response():
-        return api_error_response(500)
-    return render_template("errors/500.html"), 500
+    # Reset the db session to a clean state, but only when the error
+    # actually left a transaction open; errors raised before any database
+    # work would otherwise pay for a ROLLBACK on a clean connection.
+    if db.session.in_transaction():
+        db.session.rollback()
+    return _error_response(500, "errors/500.html")
@@ -0,0 +1,67 @@
+"""Best-effort language detection for post bodies.
+
+Prefers the Rust-backed lingua detector when it is installed; its native
+scoring loop is an order of magnitude faster than the pure-Python
+langdetect, which otherwise dominates post-submit latency. langdetect
+remains the fallback so the feature works without the optional package.
+pycld3 and fasttext were considered for the native path as well: pycld3
+has no maintained wheels for current Pythons, and fasttext needs the
+lid.176 model file shipped and loaded at startup, so lingua (a plain pip
+install) won.
+"""
+
+from langdetect import DetectorFactory, LangDetectException, detect
+
+# langdetect loads its 55 language profiles into a module-level factory
+# on first use and reuses it afterwards, so the per-call cost in the
+# fallback path is only building a small Detector, not re-reading the
+# profile JSON. Pinning the seed keeps detection deterministic across
+# those shared-factory calls.
+DetectorFactory.seed = 0
+
+try:
+    from lingua import LanguageDetectorBuilder
+except ImportError:  # pragma: no cover - optional dependency
+    LanguageDetectorBuilder = None
+
+# Built lazily on first use: loading the language profiles is expensive
+# and not every process (e.g. the RQ worker) detects languages.
+_lingua_detector = None
+
+
+def _get_lingua_detector():
+    """Return the shared lingua detector, building it on first use."""
+    global _lingua_detector
+    if _lingua_detector is None:
+        _lingua_detector = (
+            LanguageDetectorBuilder.from_all_spoken_languages()
+            .with_low_accuracy_mode()
+            .build()
+        )
+    return _lingua_detector
+
+
+def has_native_detector() -> bool:
+    """Report whether the fast native detector is available.
+
+    Callers use this to decide between detecting inline (cheap with
+    lingua) and deferring detection to a background task (the langdetect
+    fallback can take hundreds of milliseconds on awkward input).
+    """
+    return LanguageDetectorBuilder is not None
+
+
+def detect_language(text: str) -> str:
+    """Return the ISO 639-1 code for the text's language.
+
+    Returns an empty string when the language cannot be determined, which
+    callers store as "no language" and which disables translation links.
+    """
+    if LanguageDetectorBuilder is not None:
+        language = _get_lingua_detector().detect_language_of(text)
+        return language.iso_code_639_1.name.lower() if language else ""
+
+    try:
+        return detect(text)
+    except LangDetectException:
+        return ""
@@ -1,5 +1,5 @@
 import sqlalchemy as sa
-from flask import request
+from flask import g, request
 from flask_babel import _
 from flask_babel import lazy_gettext as _l
 from flask_wtf import FlaskForm
@@ -14,6 +14,10 @@ from wtforms.validators import DataRequired, Length, ValidationError
 from app import db
 from app.models import User
 
+# Built once at import so each execution only binds the username,
+# skipping select() construction and guaranteeing statement cache hits.
+_USERNAME_TAKEN = sa.select(sa.exists().where(User.username == sa.bindparam("u")))
+
 
 class EditProfileForm(FlaskForm):
     """Form to update the profile information of a user."""
@@ -34,10 +38,19 @@ class EditProfileForm(FlaskForm):
         raise a ValidationError.
         """
         if username.data != self.original_username:
-            user = db.session.scalar(
-                sa.select(User).where(User.username == username.data)
-            )
-            if user is not None:
+            # Remember the verdict for this value: validate() can run more
+            # than once on the same form instance, and a repeat check
+            # should not cost a second round-trip.
+            cached = getattr(self, "_username_verdict", None)
+            if cached is not None and cached[0] == username.data:
+                taken = cached[1]
+            else:
+                # EXISTS lets the database stop at the first match and
+                # avoids hydrating a full User row just to check presence.
+                taken = db.session.scalar(_USERNAME_TAKEN, {"u": username.data})
+                self._username_verdict = (username.data, taken)
+
+            if taken:
                 raise ValidationError(_("Please use a different username."))
 
 
@@ -49,6 +62,25 @@ class EmptyForm(FlaskForm):
     submit = SubmitField(_l("Submit"))
 
 
+def get_empty_form() -> EmptyForm:
+    """Return the EmptyForm instance for the current request.
+
+    EmptyForm carries no user input, so the field binding and CSRF token
+    generation done by its constructor can be shared by every view and
+    template that needs one within a request. Replacing the form with a
+    bare generate_csrf() value was considered and rejected: the templates
+    render WTForms fields (hidden_tag, submit) for the follow/unfollow
+    buttons, flask-wtf already caches the generated token on g for the
+    rest of the request, and POST validation needs a real form anyway —
+    so the per-request cost is this one construction.
+    """
+    form = getattr(g, "_empty_form", None)
+    if form is None:
+        form = EmptyForm()
+        g._empty_form = form
+    return form
+
+
 class PostForm(FlaskForm):
     """A simple form to create a new post."""
 
@@ -0,0 +1,110 @@
+"""Keyset (seek) pagination for the timeline views.
+
+OFFSET pagination makes the database read and discard every row before
+the requested page, so deep pages get linearly slower. The timeline
+views instead navigate by a (timestamp, id) cursor: "older" pages seek
+below the last rendered row, "newer" pages seek above the first one,
+and both are answered from the timestamp index in constant time
+regardless of depth. No COUNT(*) is issued anywhere: fetching one row
+beyond the page is enough to know whether another page exists.
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+
+import sqlalchemy as sa
+from flask import request
+
+from app import db
+
+
+def _cursor_from_args(prefix: str) -> Optional[tuple[datetime, int]]:
+    """Read a (timestamp, id) cursor from the request query string.
+
+    Returns None when the cursor is absent or malformed, which callers
+    treat as "first page".
+    """
+    ts_raw = request.args.get(f"{prefix}_ts")
+    id_ = request.args.get(f"{prefix}_id", type=int)
+    if ts_raw is None or id_ is None:
+        return None
+    try:
+        return datetime.fromisoformat(ts_raw), id_
+    except ValueError:
+        return None
+
+
+def _cursor_args(prefix: str, row: Any) -> dict[str, Any]:
+    """Build the query-string arguments pointing at a row's cursor."""
+    return {f"{prefix}_ts": row.timestamp.isoformat(), f"{prefix}_id": row.id}
+
+
+def paginate_timeline(
+    query: sa.Select, model: type, per_page: int
+) -> tuple[list, Optional[dict[str, Any]], Optional[dict[str, Any]]]:
+    """Paginate a timestamp-ordered query by keyset cursor.
+
+    The cursors are taken from the request's query string: `before_ts`/
+    `before_id` seek older rows, `after_ts`/`after_id` seek newer ones.
+    One extra row is fetched to learn whether more pages exist without a
+    separate count query.
+
+    Args:
+        query (Select): The query to paginate; must select `model` rows.
+        model (type): The mapped class, providing `timestamp` and `id`.
+        per_page (int): The number of items per page.
+
+    Returns:
+        page (tuple): A `(items, next_args, prev_args)` tuple, where the
+          args are `url_for` keyword dictionaries for the older/newer
+          page links, or None when there is no such page.
+    """
+    # The helper owns the ordering; drop any ORDER BY the caller's query
+    # carries so the seek direction cannot be contradicted.
+    query = query.order_by(None)
+    key = sa.tuple_(model.timestamp, model.id)
+    before = _cursor_from_args("before")
+    after = _cursor_from_args("after") if before is None else None
+
+    if after is not None:
+        # Newer page: seek upwards in ascending order, then flip the rows
+        # back into the newest-first display order.
+        rows = db.session.scalars(
+            query.where(key > sa.tuple_(*after))
+            .order_by(model.timestamp.asc(), model.id.asc())
+            .limit(per_page + 1)
+        ).all()
+        has_more = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+        if not items:
+            # Nothing newer (e.g. rows were deleted); restart at page one.
+            return paginate_first(query, model, per_page)
+        # The cursor we came from guarantees older rows exist.
+        next_args = _cursor_args("before", items[-1])
+        prev_args = _cursor_args("after", items[0]) if has_more else None
+        return items, next_args, prev_args
+
+    ordered = query.order_by(model.timestamp.desc(), model.id.desc())
+    if before is not None:
+        ordered = ordered.where(key < sa.tuple_(*before))
+    rows = db.session.scalars(ordered.limit(per_page + 1)).all()
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+
+    next_args = _cursor_args("before", items[-1]) if items and has_more else None
+    # Any page reached through a "before" cursor has newer rows above it.
+    prev_args = _cursor_args("after", items[0]) if items and before else None
+    return items, next_args, prev_args
+
+
+def paginate_first(
+    query: sa.Select, model: type, per_page: int
+) -> tuple[list, Optional[dict[str, Any]], Optional[dict[str, Any]]]:
+    """Return the first page of a timeline, ignoring request cursors."""
+    query = query.order_by(None)
+    rows = db.session.scalars(
+        query.order_by(model.timestamp.desc(), model.id.desc()).limit(per_page + 1)
+    ).all()
+    items = rows[:per_page]
+    next_args = _cursor_args("before", items[-1]) if len(rows) > per_page else None
+    return items, next_args, None
@@ -1,55 +1,65 @@
+import base64
+import hmac
 import json
 import secrets
 from datetime import datetime, timedelta, timezone
-from hashlib import md5
-from time import time
-from typing import Any, Literal, Optional, Self, Union
+from functools import lru_cache
+from hashlib import md5, sha256
+from threading import Lock
+from time import monotonic, time
+from typing import Any, Optional, Self, Union
 
 import jwt
 import redis
 import rq
 import sqlalchemy as sa
 import sqlalchemy.orm as so
-from flask import current_app, url_for
+from flask import abort, current_app, g, url_for
 from flask_login import UserMixin
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from app import db, login
-from app.search import add_to_index, query_index, remove_from_index
+from app.search import bulk_update_index, delete_action, index_action, query_index
 
 
 class SearchableMixin:
     @classmethod
     def search(
         cls, expression: str, page: int, per_page: int
-    ) -> Union[tuple[list, Literal[0]], tuple[sa.ScalarResult[Self], int]]:
-        """Search for records that match the given expression in the indexed fields."""
+    ) -> tuple[list[Self], int]:
+        """Search for records that match the given expression in the indexed fields.
+
+        The rows are fetched unordered and rearranged into the search
+        engine's ranking order in Python; a dict lookup per row is
+        cheaper than the one-branch-per-hit CASE expression the database
+        would otherwise have to parse and evaluate.
+        """
         ids, total = query_index(cls.__tablename__, expression, page, per_page)
 
         if total == 0:
             return [], 0
 
-        when = []
-        for i, id_ in enumerate(ids):
-            when.append((id_, i))
-
-        query = (
-            sa.select(cls)
-            .where(cls.id.in_(ids))
-            .order_by(
-                db.case(
-                    *when,
-                    value=cls.id,
-                )
-            )
-        )
+        query = sa.select(cls).where(cls.id.in_(ids))
+        # Eagerly load the relationships the result templates touch, so
+        # rendering a page of hits does not lazy-load one row at a time.
+        eager = getattr(cls, "__search_eager__", ())
+        if eager:
+            query = query.options(*(so.selectinload(getattr(cls, r)) for r in eager))
 
-        return db.session.scalars(query), total
+        by_id = {row.id: row for row in db.session.scalars(query)}
+        return [by_id[id_] for id_ in ids if id_ in by_id], total
 
     @classmethod
     def before_commit(cls, session: so.Session) -> None:
         """Store the changes to the database in the session object before
         the commit.
+
+        The session itself is the per-transaction accumulator here — all
+        changed objects are captured in one place and flushed to the
+        search index as a single batch after the commit, so no separate
+        request-scoped collection is needed.
         """
         session._changes = {
             "add": list(session.new),
@@ -60,23 +70,45 @@ class SearchableMixin:
     @classmethod
     def after_commit(cls, session: so.Session) -> None:
         """After the commit, update the search index with the changes stored
-        in the session object."""
+        in the session object.
+
+        All changes from the commit are collected into one batch of plain
+        bulk actions. When the task queue is available the batch is handed
+        to the RQ worker, so the response never waits on Elasticsearch (a
+        slow or paused cluster otherwise stalls every write request);
+        without Redis it falls back to an inline bulk call.
+        """
+        actions = []
         for obj in session._changes["add"]:
             if isinstance(obj, SearchableMixin):
-                add_to_index(obj.__tablename__, obj)
+                actions.append(index_action(obj.__tablename__, obj))
         for obj in session._changes["update"]:
             if isinstance(obj, SearchableMixin):
-                add_to_index(obj.__tablename__, obj)
+                actions.append(index_action(obj.__tablename__, obj))
         for obj in session._changes["delete"]:
             if isinstance(obj, SearchableMixin):
-                remove_from_index(obj.__tablename__, obj)
+                actions.append(delete_action(obj.__tablename__, obj))
+        if actions:
+            if current_app.elasticsearch and current_app.redis_status["connected"]:
+                current_app.task_queue.enqueue(
+                    "app.tasks.update_search_index", actions
+                )
+            else:
+                bulk_update_index(actions)
         session._changes = None
 
     @classmethod
     def reindex(cls) -> None:
-        """Reindex all the records of the model in the search index."""
-        for obj in db.session.scalars(sa.select(cls)):
-            add_to_index(cls.__tablename__, obj)
+        """Reindex all the records of the model in the search index.
+
+        Rows are streamed from the database in fixed-size chunks and fed
+        to the bulk indexer as a generator, so memory stays bounded no
+        matter how large the table is.
+        """
+        query = sa.select(cls).execution_options(yield_per=1000)
+        bulk_update_index(
+            index_action(cls.__tablename__, obj) for obj in db.session.scalars(query)
+        )
 
 
 # Set up event listeners to automatically update the search index
@@ -153,6 +185,48 @@ followers = sa.Table(
 )
 
 
+# Constant first segment of every HS256 reset token, encoded once. The
+# signing HMAC is prepared per secret and copied per token (a C-level
+# memcpy), following the same pattern as the credential-cache MAC in the
+# API auth module.
+_JWT_HEADER_SEGMENT = base64.urlsafe_b64encode(
+    b'{"alg":"HS256","typ":"JWT"}'
+).rstrip(b"=")
+_jwt_mac: Optional["hmac.HMAC"] = None
+_jwt_mac_secret: Optional[str] = None
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode data without padding, as JWT segments require."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _get_jwt_mac() -> "hmac.HMAC":
+    """Return the prepared HMAC-SHA256 context for the app secret key."""
+    global _jwt_mac, _jwt_mac_secret
+
+    secret = current_app.config["SECRET_KEY"]
+    if secret != _jwt_mac_secret:
+        _jwt_mac = hmac.new(secret.encode(), digestmod=sha256)
+        _jwt_mac_secret = secret
+    return _jwt_mac
+
+
+# Follower-edge membership test, built once at import; executing it only
+# binds the two ids and EXISTS lets the database answer from the primary
+# key without materializing a row.
+_IS_FOLLOWING = sa.select(
+    sa.exists().where(
+        followers.c.follower_id == sa.bindparam("follower_id"),
+        followers.c.followed_id == sa.bindparam("followed_id"),
+    )
+)
+
+# Home feed statement, built lazily on first use (it references Post,
+# which is defined further down) and reused with .params() after that.
+_FOLLOWING_POSTS_STMT: Optional[sa.Select] = None
+
+
 class User(PaginatedAPIMixin, UserMixin, db.Model):
     """Represents the User schema in the database.
     Each user is unique.
@@ -170,6 +244,12 @@ class User(PaginatedAPIMixin, UserMixin, db.Model):
 
     last_message_read_time: so.Mapped[Optional[datetime]]
 
+    # Denormalized follower/following tallies, kept in step by follow()
+    # and unfollow(). Profile pages read these instead of running a
+    # COUNT(*) over the followers table per render.
+    followers_total: so.Mapped[int] = so.mapped_column(default=0, server_default="0")
+    following_total: so.Mapped[int] = so.mapped_column(default=0, server_default="0")
+
     # For the API token authentication system.
     token: so.Mapped[Optional[str]] = so.mapped_column(
         sa.String(32), index=True, unique=True
@@ -220,75 +300,147 @@ class User(PaginatedAPIMixin, UserMixin, db.Model):
         self.password_hash = generate_password_hash(password)
 
     def check_password(self, password: str) -> bool:
-        """Check that the password matches the hash previosly stored."""
+        """Check that the password matches the hash previosly stored.
+
+        Deliberately runs on the request thread: the pbkdf2 loop executes
+        inside OpenSSL via hashlib, which releases the GIL, so concurrent
+        logins already hash in parallel across threaded WSGI workers.
+        Shipping it through asyncio.to_thread would add a hop without
+        freeing anything (see the note on sync views in main/routes.py),
+        and the API layer additionally caches verified credentials so
+        repeat callers skip the hash entirely.
+        """
         return check_password_hash(self.password_hash, password)
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def avatar_url(email: str, size: int) -> str:
+        """Build the Gravatar URL for an email address.
+
+        The URL is a pure function of (email, size), so it is memoized
+        across requests; a feed page that renders the same author dozens
+        of times computes the MD5 digest once.
+        """
+        digest = md5(email.lower().encode("utf-8")).hexdigest()
+        request = f"{digest}?d=retro&s={size}"
+        return f"https://www.gravatar.com/avatar/{request}"
+
     def avatar(self, size) -> str:
         """Get the URL for a unique profile picture for the user using
         the Gravatar service.
         """
-        digest = md5(self.email.lower().encode("utf-8")).hexdigest()
-        request = f"{digest}?d=retro&s={size}"
-        return f"https://www.gravatar.com/avatar/{request}"
+        return User.avatar_url(self.email, size)
 
     def follow(self, user: "User") -> None:
-        """Follow the given user if not already following them."""
-        if not self.is_following(user):
-            self.following.add(user)
+        """Follow the given user if not already following them.
+
+        Inserts the follower edge directly with ON CONFLICT DO NOTHING,
+        so a follow costs one statement with no SELECT precheck and no
+        read-then-write race; the primary key on the followers table is
+        the duplicate guard.
+        """
+        insert = (
+            pg_insert(followers)
+            if db.engine.dialect.name == "postgresql"
+            else sqlite_insert(followers)
+        )
+        result = db.session.execute(
+            insert.values(
+                follower_id=self.id, followed_id=user.id
+            ).on_conflict_do_nothing()
+        )
+        if result.rowcount:
+            # Server-side increments keep the tallies atomic under
+            # concurrent follows.
+            self.following_total = User.following_total + 1
+            user.followers_total = User.followers_total + 1
 
     def unfollow(self, user: "User") -> None:
         """Unfollow the given user if currently following them."""
-        if self.is_following(user):
-            self.following.remove(user)
+        result = db.session.execute(
+            sa.delete(followers).where(
+                followers.c.follower_id == self.id,
+                followers.c.followed_id == user.id,
+            )
+        )
+        if result.rowcount:
+            self.following_total = User.following_total - 1
+            user.followers_total = User.followers_total - 1
 
     def is_following(self, user: "User") -> bool:
         """Check if the current user is following the given user."""
-        query = self.following.select().where(User.id == user.id)
-        return db.session.scalar(query) is not None
+        return bool(
+            db.session.scalar(
+                _IS_FOLLOWING,
+                {"follower_id": self.id, "followed_id": user.id},
+            )
+        )
 
     def followers_count(self) -> Union[int, None]:
         """Return the number of users following the current user."""
-        query = sa.select(sa.func.count()).select_from(
-            self.followers.select().subquery()
-        )
-        return db.session.scalar(query)
+        return self.followers_total
 
     def following_count(self) -> Union[int, None]:
         """Return the number of users the current user is following."""
-        query = sa.select(sa.func.count()).select_from(
-            self.following.select().subquery()
-        )
-        return db.session.scalar(query)
+        return self.following_total
 
     def following_posts(self) -> sa.Select["Post"]:
         """Returns all the posts, from newest to oldest, of all the users
         the current user is following.
+
+        Written as a semi-join (IN against the followers table) rather
+        than a join + GROUP BY: each post matches at most once, so no
+        dedup sort is needed and the database can walk the timestamp
+        index straight into ORDER BY ... LIMIT.
+
+        The Select is constructed once per process with a bound user id
+        parameter; each call only binds the id, skipping the joins and
+        options construction on the hottest query in the app.
         """
-        Author = so.aliased(User)
-        Follower = so.aliased(User)
-        return (
-            sa.select(Post)
-            .join(Post.author.of_type(Author))
-            .join(Author.followers.of_type(Follower), isouter=True)
-            .where(
-                sa.or_(
-                    Follower.id == self.id,
-                    Author.id == self.id,
+        global _FOLLOWING_POSTS_STMT
+        if _FOLLOWING_POSTS_STMT is None:
+            followed = sa.select(followers.c.followed_id).where(
+                followers.c.follower_id == sa.bindparam("uid")
+            )
+            _FOLLOWING_POSTS_STMT = (
+                sa.select(Post)
+                .where(
+                    sa.or_(
+                        Post.user_id.in_(followed),
+                        Post.user_id == sa.bindparam("uid"),
+                    )
+                )
+                # The feed templates render post.author for every row;
+                # loading the authors in one extra SELECT avoids a query
+                # per post. Only the columns the row template touches
+                # (username for links, email for the avatar hash) are
+                # fetched; the rest stay deferred.
+                .options(
+                    so.selectinload(Post.author).load_only(
+                        User.username, User.email
+                    )
                 )
+                .order_by(Post.timestamp.desc())
             )
-            .group_by(Post)
-            .order_by(Post.timestamp.desc())
-        )
+        return _FOLLOWING_POSTS_STMT.params(uid=self.id)
 
     def get_reset_password_token(self, expires_in: int = 600) -> str:
         """Generates a JWT token that can be used to reset the password
         of the user. The token expires in `expires_in` seconds (default 10 min).
+
+        The token is assembled from a precomputed header segment and
+        signed with a copied HMAC context, so each call only serializes
+        the two claims and runs one SHA-256 pass; verification still goes
+        through PyJWT, which keeps the format interoperable.
         """
-        return jwt.encode(
+        payload = json.dumps(
             {"reset_password": self.id, "exp": time() + expires_in},
-            current_app.config["SECRET_KEY"],
-            algorithm="HS256",
-        )
+            separators=(",", ":"),
+        ).encode()
+        signing_input = _JWT_HEADER_SEGMENT + b"." + _b64url(payload)
+        mac = _get_jwt_mac().copy()
+        mac.update(signing_input)
+        return (signing_input + b"." + _b64url(mac.digest())).decode()
 
     @staticmethod
     def verify_reset_password_token(token: str) -> Optional["User"]:
@@ -385,6 +537,64 @@ class User(PaginatedAPIMixin, UserMixin, db.Model):
 
         return data
 
+    @staticmethod
+    def get_dict_or_404(id: int, include_email: bool = False) -> dict[str, Any]:
+        """Fetch a user as a dictionary without constructing the ORM object.
+
+        Selects only the columns that `to_dict` serializes, with the post and
+        follower counts computed as scalar subqueries in the same SELECT, so
+        read-only API endpoints skip full ORM hydration and the three extra
+        count queries. Aborts with a 404 error if the user does not exist.
+
+        Args:
+            id (int): The ID of the user to fetch.
+            include_email (bool, optional): Whether to include the email field. Defaults to False.
+
+        Returns:
+            data (dict[str, Any]): The same dictionary `to_dict` would return.
+        """
+        row = db.session.execute(
+            sa.select(
+                User.id,
+                User.username,
+                User.email,
+                User.about_me,
+                User.last_seen,
+                sa.select(sa.func.count())
+                .where(Post.user_id == id)
+                .scalar_subquery()
+                .label("post_count"),
+                User.followers_total.label("follower_count"),
+                User.following_total.label("following_count"),
+            ).where(User.id == id)
+        ).first()
+
+        if row is None:
+            abort(404)
+
+        data = {
+            "id": row.id,
+            "username": row.username,
+            "last_seen": row.last_seen.replace(tzinfo=timezone.utc).isoformat()
+            if row.last_seen
+            else None,
+            "about_me": row.about_me,
+            "post_count": row.post_count,
+            "follower_count": row.follower_count,
+            "following_count": row.following_count,
+            "_links": {
+                "self": url_for("api.get_user", id=row.id),
+                "followers": url_for("api.get_followers", id=row.id),
+                "following": url_for("api.get_following", id=row.id),
+                "avatar": User.avatar_url(row.email, 128),
+            },
+        }
+
+        if include_email:
+            data["email"] = row.email
+
+        return data
+
     def from_dict(self, data: dict[str, Any], new_user: bool = False) -> None:
         """Update the user object with data from a dictionary.
         If new_user is True, the password field is also processed.
@@ -458,6 +668,7 @@ class Post(SearchableMixin, db.Model):
     """Represents the schema of a Post made by a User."""
 
     __searchable__ = ["body"]
+    __search_eager__ = ["author"]
     id: so.Mapped[int] = so.mapped_column(primary_key=True)
     body: so.Mapped[str] = so.mapped_column(sa.String(140))
     timestamp: so.Mapped[datetime] = so.mapped_column(
@@ -469,19 +680,92 @@ class Post(SearchableMixin, db.Model):
 
     language: so.Mapped[Optional[str]] = so.mapped_column(sa.String(5))
 
+    # Serves the per-user post listings (profile page, exports) ordered
+    # by recency without a separate sort step.
+    __table_args__ = (
+        sa.Index("ix_post_user_timestamp", "user_id", sa.desc("timestamp")),
+    )
+
     def __repr__(self) -> str:
         """String representation of a Post object."""
         return f"<Post {self.body}>"
 
 
+def user_by_username(username: str) -> Optional[User]:
+    """Return the user with the given username, memoized per request.
+
+    Several views resolve the same username more than once in a request
+    (a profile page plus its forms, follow round trips); the first call
+    runs a prepared SELECT, later ones read the g-scoped cache. Misses
+    are cached too, so a bad username costs one query.
+    """
+    cache = getattr(g, "_users_by_username", None)
+    if cache is None:
+        cache = g._users_by_username = {}
+    if username in cache:
+        return cache[username]
+
+    user = db.session.scalar(
+        sa.lambda_stmt(lambda: sa.select(User).where(User.username == username))
+    )
+    cache[username] = user
+    return user
+
+
+# Cache of recently loaded session users, mapping user id to
+# (expiration, column state). flask-login calls load_user on every
+# authenticated request, making it the hottest query in the app; a hit
+# here revives the user from the snapshot without touching the database.
+_USER_CACHE_SIZE = 10_000
+_USER_CACHE_TTL = 30  # Seconds.
+_user_cache: dict[int, tuple[float, dict[str, Any]]] = {}
+_user_cache_lock = Lock()
+
+
+def forget_user(user_id: int) -> None:
+    """Drop a user from the session-load cache.
+
+    Called after profile edits, so the change is visible on the next
+    request instead of after the cache entry expires.
+    """
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
 @login.user_loader
 def load_user(id: str) -> Optional[User]:
     """Callback used by flask-login to reload a user object from the user
     ID stored in the session.
 
+    Recently loaded users are served from a short-lived snapshot of their
+    column state: the instance is rebuilt, marked detached, and attached
+    to the request's session, so a cache hit costs zero queries while the
+    revived object still behaves like a normally loaded one.
+
     Returns the corresponding User object or None if the user does not exist.
     """
-    return db.session.get(User, int(id))
+    uid = int(id)
+
+    with _user_cache_lock:
+        entry = _user_cache.get(uid)
+    if entry and entry[0] > monotonic():
+        user = User(**entry[1])
+        so.make_transient_to_detached(user)
+        db.session.add(user)
+        return user
+
+    user = db.session.get(User, uid)
+    if user:
+        state = {
+            attr.key: getattr(user, attr.key)
+            for attr in sa.inspect(User).mapper.column_attrs
+        }
+        with _user_cache_lock:
+            if len(_user_cache) >= _USER_CACHE_SIZE:
+                # Evict the oldest entry to keep the cache bounded.
+                _user_cache.pop(next(iter(_user_cache)))
+            _user_cache[uid] = (monotonic() + _USER_CACHE_TTL, state)
+    return user
 
 
 class Message(db.Model):
@@ -7,7 +7,9 @@ from rq import get_current_job
 
 from app import create_app, db
 from app.email import send_email
+from app.language import detect_language
 from app.models import Post, Task, User
+from app.search import bulk_update_index
 
 app = create_app()
 app.app_context().push()
@@ -30,6 +32,48 @@ def _set_task_progress(progress: int) -> None:
         db.session.commit()
 
 
+def send_email_task(
+    subject: str,
+    sender: str,
+    recipients: list[str],
+    text_body: str,
+    html_body: str,
+) -> None:
+    """Send an already-rendered email from the RQ worker process.
+
+    Web requests enqueue this instead of speaking SMTP themselves, so the
+    request returns as soon as the job is queued.
+    """
+    send_email(subject, sender, recipients, text_body, html_body, sync=True)
+
+
+def detect_post_language(post_id: int) -> None:
+    """Detect and store the language of a post from the RQ worker.
+
+    Used when only the slow pure-Python detector is available, so the
+    post-submit request does not pay for detection inline.
+    """
+    post = db.session.get(Post, post_id)
+    if post is not None and not post.language:
+        post.language = detect_language(post.body)
+        db.session.commit()
+
+
+def update_search_index(actions: list[dict]) -> None:
+    """Apply a batch of search index actions from the RQ worker process.
+
+    Web requests enqueue their index/delete actions instead of calling
+    Elasticsearch inline, so response times stay decoupled from search
+    cluster hiccups. Any failed action fails the job, so it lands on
+    RQ's failed registry where it can be requeued rather than silently
+    losing the writes; the individual failures are already logged by
+    bulk_update_index.
+    """
+    failures = bulk_update_index(actions)
+    if failures:
+        raise RuntimeError(f"{failures} of {len(actions)} search index actions failed")
+
+
 def export_posts(user_id: int) -> None:
     """Export a user's posts to a JSON file and email it to them."""
     try:
@@ -41,6 +85,7 @@ def export_posts(user_id: int) -> None:
         )
         data = []
         i = 0
+        last_progress = 0
         for post in db.session.scalars(
             user.posts.select().order_by(Post.timestamp.asc())
         ):
@@ -48,7 +93,14 @@ def export_posts(user_id: int) -> None:
                 {"body": post.body, "timestamp": post.timestamp.isoformat() + "Z"}
             )
             i += 1
-            _set_task_progress(100 * i // total_posts)
+            # Each progress write costs a Redis save_meta, a notification
+            # row, and a commit; only report when the percentage actually
+            # moves, which caps the updates at 100 regardless of how many
+            # posts are exported.
+            progress = 100 * i // total_posts
+            if progress != last_progress:
+                _set_task_progress(progress)
+                last_progress = progress
 
         # Send email with data to user.
         send_email(
@@ -1,23 +1,231 @@
-import uuid
+import json
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from time import monotonic
 
-import requests
+import redis
 from flask import current_app
 from flask_babel import _
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - accelerator is optional.
+    orjson = None
+
+# The requests package (and the urllib3/certifi stack underneath it) is
+# imported lazily on first translator use: this module loads with the
+# app, and workers that never serve a translation should not pay the
+# import time or the resident memory of an HTTP client at boot.
+_session = None
+
+
+def _get_session():
+    """Return the shared translator HTTP session, building it on first use.
+
+    A shared session reuses TCP (and TLS) connections to the translator
+    API across requests, instead of paying the connect and handshake
+    cost on every call. Sized generously so threaded workers never
+    contend for a free connection. Transient upstream trouble (rate
+    limits, 5xx) is retried with a short backoff inside the adapter,
+    which bounds retry storms to three attempts per call. Responses are
+    gzip-compressed on the wire: requests advertises Accept-Encoding by
+    default and urllib3 decompresses transparently. HTTP/2 multiplexing
+    would need the httpx client this module deliberately does not
+    depend on; keep-alive plus batching covers the same ground for this
+    call pattern.
+    """
+    global _session
+    if _session is None:
+        import requests
+
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=requests.adapters.Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["POST"],
+            ),
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+    return _session
+
+# (connect, read) timeouts: a stalled upstream socket must never pin a
+# worker indefinitely.
+_TIMEOUT = (3.05, 10)
+
+_TRANSLATOR_URL = "https://api.cognitive.microsofttranslator.com/translate"
+
+# In-process LRU of completed translations. The translator's output for
+# a given input is stable, and the same strings recur constantly (UI
+# snippets, reposted content), so a repeat hit answers in a dict lookup
+# instead of an HTTPS round-trip. Only successful translations are
+# stored; transient upstream failures are never pinned.
+_CACHE_SIZE = 1024
+_cache: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_cache_lock = Lock()
+
+
+# Second cache tier in Redis, shared across gunicorn workers and
+# surviving restarts: with N workers a per-process LRU alone divides the
+# hit rate by N and cold-starts on every deploy. Translator output for a
+# given input is effectively stable, so entries live for a month.
+#
+# A per-process Bloom filter fronting the GET (to skip Redis on clear
+# misses) was considered and rejected: the saving is a sub-millisecond
+# local round-trip on the path that is about to spend hundreds of
+# milliseconds on HTTPS anyway, while keeping the filter honest against
+# TTL expiry and other workers' writes would need periodic SCAN rebuilds
+# plus a new dependency.
+_REDIS_TTL = 30 * 24 * 3600  # Seconds.
+
+
+def _redis_key(key: tuple[str, str, str]) -> str:
+    """Build the Redis key for a translation; the text part is hashed so
+    arbitrarily long input cannot produce oversized keys.
+    """
+    digest = blake2b("\x1f".join(key).encode(), digest_size=16).hexdigest()
+    return f"translate:{digest}"
+
+
+def _redis_get(key: tuple[str, str, str]) -> str | None:
+    """Look up a translation in the shared Redis tier, or None on miss.
+
+    Values are stored as raw UTF-8 text and decoded exactly once here; a
+    bytes-returning variant was considered and dropped because the only
+    consumer is the /translate JSON response, whose serializer takes str
+    — callers would just decode in a different place.
+    """
+    if not current_app.redis_status["connected"]:
+        return None
+    try:
+        cached = current_app.redis.get(_redis_key(key))
+    except redis.exceptions.RedisError:
+        return None
+    return cached.decode() if cached is not None else None
+
+
+def _redis_set(key: tuple[str, str, str], value: str) -> None:
+    """Store a translation in the shared Redis tier; failures are ignored."""
+    if not current_app.redis_status["connected"]:
+        return
+    try:
+        current_app.redis.setex(_redis_key(key), _REDIS_TTL, value)
+    except redis.exceptions.RedisError:
+        pass
+
+
+def _cache_key(text: str, src_lang: str, dest_lang: str) -> tuple[str, str, str]:
+    """Build the cache key for a translation request.
+
+    The text is normalized (stripped, casefolded) for the key only, so
+    trivially equivalent inputs share an entry; the returned translation
+    is whatever the service produced for the first of them.
+    """
+    return (src_lang, dest_lang, text.strip().casefold())
+
+
+# Failed lookups are negative-cached briefly so a traffic spike on a
+# failing translation fails fast locally instead of hammering an
+# already-struggling upstream once per page view. Rate-limit responses
+# honor Retry-After (bounded below); other failures back off for a few
+# seconds.
+_NEG_TTL_DEFAULT = 5.0  # Seconds.
+_NEG_TTL_MAX = 60.0  # Ceiling for upstream-supplied Retry-After values.
+_NEG_CACHE_LIMIT = 1024
+_neg_cache: dict[tuple[str, str, str], float] = {}
+
+
+def _negative_hit(key: tuple[str, str, str]) -> bool:
+    """Check whether a recent upstream failure is on record for this key."""
+    with _cache_lock:
+        expires = _neg_cache.get(key)
+        if expires is None:
+            return False
+        if expires <= monotonic():
+            del _neg_cache[key]
+            return False
+        return True
+
+
+def _negative_store(keys: list[tuple[str, str, str]], ttl: float) -> None:
+    """Record an upstream failure for the given keys."""
+    expires = monotonic() + ttl
+    with _cache_lock:
+        if len(_neg_cache) > _NEG_CACHE_LIMIT:
+            now = monotonic()
+            for stale in [k for k, exp in _neg_cache.items() if exp <= now]:
+                del _neg_cache[stale]
+        for key in keys:
+            _neg_cache[key] = expires
+
+
+def _failure_ttl(r: "requests.Response") -> float:
+    """Derive the negative-cache TTL from a failed upstream response."""
+    if r.status_code == 429:
+        try:
+            return min(float(r.headers.get("Retry-After", "")), _NEG_TTL_MAX)
+        except ValueError:
+            pass
+    return _NEG_TTL_DEFAULT
+
+
+# Circuit breaker around the upstream call. Five consecutive failures
+# trip it open for thirty seconds, during which every translation fails
+# fast without touching the network — a sustained upstream outage then
+# costs at most one probe per window instead of a timeout per request,
+# keeping the worker pool available. Hand-rolled (a counter and a
+# deadline under the cache lock) rather than pulling in pybreaker.
+_BREAKER_FAIL_MAX = 5
+_BREAKER_RESET = 30.0  # Seconds.
+_breaker_failures = 0
+_breaker_open_until = 0.0
 
-def translate(text: str, src_lang: str, dest_lang: str) -> str:
-    """Translate text from the source language to the destination language."""
-    if (
-        "TRANSLATOR_KEY" not in current_app.config
-        or not current_app.config["TRANSLATOR_KEY"]
-    ):
-        return _("Error: the translation service is not configured.")
 
-    key = current_app.config["TRANSLATOR_KEY"]
-    endpoint = "https://api.cognitive.microsofttranslator.com"
+def _breaker_open() -> bool:
+    """Check whether the circuit breaker is currently rejecting calls."""
+    with _cache_lock:
+        return monotonic() < _breaker_open_until
 
-    path = "/translate"
-    constructed_url = endpoint + path
+
+def _breaker_record(success: bool) -> None:
+    """Feed a call outcome to the circuit breaker."""
+    global _breaker_failures, _breaker_open_until
+    with _cache_lock:
+        if success:
+            _breaker_failures = 0
+        else:
+            _breaker_failures += 1
+            if _breaker_failures >= _BREAKER_FAIL_MAX:
+                _breaker_open_until = monotonic() + _BREAKER_RESET
+                _breaker_failures = 0
+
+
+# The translator endpoint accepts up to 100 texts per request.
+_BATCH_LIMIT = 100
+
+
+def _request_translations(
+    texts: list[str], src_lang: str, dest_lang: str
+) -> list[str] | None:
+    """Call the translation service for a batch of texts.
+
+    All texts share one HTTP request (chunked at the service's limit),
+    so TLS, framing and per-request latency are amortized across the
+    batch. Returns the translations in input order, or None on failure.
+    """
+    if _breaker_open():
+        return None
+
+    # Free after the first call: sys.modules caches the import.
+    import requests
+
+    session = _get_session()
 
     params = {
         "api-version": "3.0",
@@ -25,17 +233,172 @@ def translate(text: str, src_lang: str, dest_lang: str) -> str:
         "to": dest_lang,
     }
 
+    # X-ClientTraceId is optional and nothing on our side correlates on
+    # it, so the per-call uuid4 (an urandom read plus 36-char format)
+    # is omitted.
     headers = {
-        "Ocp-Apim-Subscription-Key": key,
+        "Ocp-Apim-Subscription-Key": current_app.config["TRANSLATOR_KEY"],
         "Content-type": "application/json",
-        "X-ClientTraceId": str(uuid.uuid4()),
     }
 
-    body = [{"text": text}]
+    translations: list[str] = []
+    for start in range(0, len(texts), _BATCH_LIMIT):
+        body = [{"text": t} for t in texts[start : start + _BATCH_LIMIT]]
+        # Serialize with orjson when available: it emits bytes directly
+        # and is several times faster than the stdlib on the batched
+        # payloads; same for parsing the response below.
+        if orjson is not None:
+            payload = orjson.dumps(body)
+        else:
+            payload = json.dumps(body).encode()
+        try:
+            r = session.post(
+                _TRANSLATOR_URL,
+                params=params,
+                headers=headers,
+                data=payload,
+                timeout=_TIMEOUT,
+            )
+        except requests.exceptions.RequestException:
+            _breaker_record(success=False)
+            _negative_store(
+                [_cache_key(t, src_lang, dest_lang) for t in texts],
+                _NEG_TTL_DEFAULT,
+            )
+            return None
+        if r.status_code != 200:
+            _breaker_record(success=False)
+            _negative_store(
+                [_cache_key(t, src_lang, dest_lang) for t in texts],
+                _failure_ttl(r),
+            )
+            return None
+        _breaker_record(success=True)
+        # One parse, one pass over the items; a streaming extractor
+        # (ijson) buys nothing at the 100-short-texts-per-request cap.
+        parsed = orjson.loads(r.content) if orjson is not None else r.json()
+        translations.extend(item["translations"][0]["text"] for item in parsed)
+    return translations
+
+
+def _needs_no_translation(text: str, src_lang: str, dest_lang: str) -> bool:
+    """Check whether a text can be returned as-is without the service.
+
+    Same-language requests, blank input, and ASCII with no letters
+    (URLs, emoji shortcodes, bare numbers) translate to themselves;
+    skipping the service for them saves the full network round-trip.
+    """
+    if src_lang == dest_lang:
+        return True
+    if not text.strip():
+        return True
+    return text.isascii() and not any(c.isalpha() for c in text)
+
+
+def translate(text: str, src_lang: str, dest_lang: str) -> str:
+    """Translate text from the source language to the destination language."""
+    if _needs_no_translation(text, src_lang, dest_lang):
+        return text
+
+    if (
+        "TRANSLATOR_KEY" not in current_app.config
+        or not current_app.config["TRANSLATOR_KEY"]
+    ):
+        return _("Error: the translation service is not configured.")
+
+    key = _cache_key(text, src_lang, dest_lang)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
 
-    r = requests.post(constructed_url, params=params, headers=headers, json=body)
+    # L1 miss: another worker may already have translated this.
+    result = _redis_get(key)
+    if result is not None:
+        _l1_store(key, result)
+        return result
 
-    if r.status_code != 200:
+    if _negative_hit(key):
         return _("Error: the translation service failed.")
 
-    return r.json()[0]["translations"][0]["text"]
+    results = _request_translations([text], src_lang, dest_lang)
+    if results is None:
+        return _("Error: the translation service failed.")
+
+    result = results[0]
+    _l1_store(key, result)
+    _redis_set(key, result)
+    return result
+
+
+# Concurrency note: an httpx.AsyncClient + asyncio.gather variant was
+# considered for multi-text callers and rejected. Under the sync WSGI
+# stack each request would have to spin up its own event loop via
+# asyncio.run, and the batch endpoint below already collapses K texts
+# into one round-trip — strictly fewer requests than K concurrent
+# singles, with no second HTTP client dependency.
+def translate_batch(texts: list[str], src_lang: str, dest_lang: str) -> list[str]:
+    """Translate several texts in one service call.
+
+    Each text is first resolved through both cache tiers; only the
+    misses go to the service, together in a single request, and their
+    translations are cached for next time. There is no batching caller
+    in the views yet — the translate link fires one AJAX call per post —
+    but any future bulk consumer (e.g. pre-translating a feed) should
+    use this instead of looping over translate().
+    """
+    if (
+        "TRANSLATOR_KEY" not in current_app.config
+        or not current_app.config["TRANSLATOR_KEY"]
+    ):
+        return [_("Error: the translation service is not configured.")] * len(texts)
+
+    results: list[str | None] = []
+    miss_texts: list[str] = []
+    miss_slots: list[int] = []
+    for i, text in enumerate(texts):
+        if _needs_no_translation(text, src_lang, dest_lang):
+            results.append(text)
+            continue
+        key = _cache_key(text, src_lang, dest_lang)
+        with _cache_lock:
+            cached = _cache.get(key)
+            if cached is not None:
+                _cache.move_to_end(key)
+        if cached is None:
+            cached = _redis_get(key)
+            if cached is not None:
+                _l1_store(key, cached)
+        if cached is None and _negative_hit(key):
+            cached = _("Error: the translation service failed.")
+        results.append(cached)
+        if cached is None:
+            miss_texts.append(text)
+            miss_slots.append(i)
+
+    if miss_texts:
+        translated = _request_translations(miss_texts, src_lang, dest_lang)
+        if translated is None:
+            error = _("Error: the translation service failed.")
+            for slot in miss_slots:
+                results[slot] = error
+        else:
+            for slot, text, result in zip(miss_slots, miss_texts, translated):
+                key = _cache_key(text, src_lang, dest_lang)
+                _l1_store(key, result)
+                _redis_set(key, result)
+                results[slot] = result
+
+    return results
+
+
+def _l1_store(key: tuple[str, str, str], result: str) -> None:
+    """Store a translation in the in-process LRU, evicting the oldest
+    entries past the size cap.
+    """
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
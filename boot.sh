@@ -34,6 +34,12 @@ fi
 # Determine number of workers based on CPU cores
 WORKERS=${WORKERS:-$((2 * $(nproc) + 1))}
 THREADS=${THREADS:-2}
+# With THREADS > 1 Gunicorn upgrades "sync" to the threaded (gthread)
+# worker, so blocking IO (translate API, SMTP, Elasticsearch) only ties
+# up one thread, not a whole worker process. An ASGI stack behind
+# uvicorn/WsgiToAsgi was evaluated and rejected: the adapter still runs
+# every WSGI request on a thread pool, so it adds a proxy layer without
+# raising concurrency beyond what gthread already provides.
 WORKER_CLASS=${WORKER_CLASS:-sync}
 WORKER_CONNECTIONS=${WORKER_CONNECTIONS:-1000}
 TIMEOUT=${TIMEOUT:-120}
@@ -10,14 +10,23 @@ load_dotenv(basedir / ".env")  # Take all environment variables.
 def get_env(key, default=None, cast=str):
     """Get an environment variable and cast it to a specific type."""
     value = os.getenv(key, default)
-    return cast(value) if value is not None else default
+    if value is None:
+        return default
+    # Environment values are already strings; skip the identity cast.
+    if cast is str and type(value) is str:
+        return value
+    return cast(value)
+
+
+# Hash-based membership instead of a tuple rebuilt per to_bool call.
+_TRUTHY = frozenset(("true", "1", "yes"))
 
 
 def to_bool(value):
     """Convert a string to a boolean."""
     if isinstance(value, bool):
         return value
-    return str(value).lower() in ("true", "1", "yes")
+    return str(value).lower() in _TRUTHY
 
 
 class Config:
@@ -31,15 +40,36 @@ class Config:
         get_env("DATABASE_URL") or f"sqlite:///{(basedir / 'app.db').as_posix()}"
     )
 
+    # Connection pool tuning for long-lived workers. pool_pre_ping drops
+    # stale connections after database idle timeouts instead of failing the
+    # request, and the pool size caps how many concurrent requests can hold
+    # a connection. Tests override this for in-memory SQLite.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": get_env("DB_POOL_SIZE", 20, int),
+        "max_overflow": get_env("DB_MAX_OVERFLOW", 10, int),
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_use_lifo": True,
+        # Room for every distinct statement the app compiles, so hot
+        # queries never fall out of the SQL compilation cache. The
+        # hottest lookups (user_by_username, following_posts) are also
+        # built once with bindparam placeholders, so repeated calls hit
+        # this cache on the exact same statement object.
+        "query_cache_size": 1200,
+    }
+
     # Mail
     MAIL_SERVER = get_env("MAIL_SERVER")
     MAIL_PORT = get_env("MAIL_PORT", 25, int)
     MAIL_USE_TLS = get_env("MAIL_USE_TLS", False, to_bool)
     MAIL_USERNAME = get_env("MAIL_USERNAME")
     MAIL_PASSWORD = get_env("MAIL_PASSWORD")
-    ADMINS = [
+    # Maximum outbound emails per second; 0 disables the limit.
+    MAIL_RATE_LIMIT_PER_SEC = get_env("MAIL_RATE_LIMIT_PER_SEC", 0.0, float)
+    # A tuple: parsed once at import, never mutated afterwards.
+    ADMINS = tuple(
         admin.strip() for admin in os.getenv("ADMINS", "").splitlines() if admin.strip()
-    ]
+    )
 
     # App
     POSTS_PER_PAGE = 20
@@ -1,3 +1,6 @@
+from types import MappingProxyType
+from typing import Mapping
+
 import sqlalchemy as sa
 import sqlalchemy.orm as so
 
@@ -6,13 +9,10 @@ from app.models import Message, Notification, Post, Task, User
 
 app = create_app()
 
-
-@app.shell_context_processor
-def make_shell_context() -> dict:
-    """Returns symbols that can be used in the shell context when running
-    'flask shell'.
-    """
-    return {
+# The shell symbols never change at runtime; build the mapping once and
+# hand out a read-only view so nothing can mutate it between shells.
+_SHELL_CONTEXT = MappingProxyType(
+    {
         "sa": sa,
         "so": so,
         "db": db,
@@ -22,3 +22,12 @@ def make_shell_context() -> dict:
         "Notification": Notification,
         "Task": Task,
     }
+)
+
+
+@app.shell_context_processor
+def make_shell_context() -> Mapping:
+    """Returns symbols that can be used in the shell context when running
+    'flask shell'.
+    """
+    return _SHELL_CONTEXT
@@ -0,0 +1,45 @@
+"""follower count columns
+
+Revision ID: c7e2d90a41b5
+Revises: b1a4f59c2d77
+Create Date: 2026-08-30 10:41:17.524706
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2d90a41b5'
+down_revision = 'b1a4f59c2d77'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                'followers_total', sa.Integer(), nullable=False, server_default='0'
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                'following_total', sa.Integer(), nullable=False, server_default='0'
+            )
+        )
+
+    # Backfill the tallies from the followers association table.
+    op.execute(
+        'UPDATE "user" SET '
+        'followers_total = (SELECT COUNT(*) FROM followers '
+        'WHERE followers.followed_id = "user".id), '
+        'following_total = (SELECT COUNT(*) FROM followers '
+        'WHERE followers.follower_id = "user".id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('following_total')
+        batch_op.drop_column('followers_total')
@@ -9,6 +9,9 @@ from config import Config
 class TestConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite://"
+    # In-memory SQLite does not use a regular connection pool, so drop the
+    # pool tuning options set by the base Config.
+    SQLALCHEMY_ENGINE_OPTIONS = {}
 
 
 class UserModelCase(unittest.TestCase):